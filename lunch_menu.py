@@ -6,25 +6,328 @@ GitHub Actions + EasyOCR + Telegram Bot
 
 import os
 import re
+from html import unescape
+from urllib.parse import unquote, parse_qs, urlparse
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from PIL import Image
 from io import BytesIO
+import numpy as np
 import easyocr
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# OCR 백엔드 (모델 로딩이 무거우므로 프로세스 내에서 한 번만 초기화)
+_OCR_BACKEND = None
+
+# OCR 입력 이미지 최대 변 길이 (글자 크기 대비 충분, 픽셀 수를 줄여 OCR 속도 향상)
+OCR_MAX_SIZE = 1024
+
+# 카카오 채널 게시글 API (채널 웹 페이지가 내부적으로 호출하는 JSON 엔드포인트)
+KAKAO_POSTS_API = 'https://pf.kakao.com/rocket-web/web/profiles/{channel_id}/posts'
+
+# 실행 상태 디렉토리 (오늘 전송 완료 표시 파일 저장, GitHub Actions 캐시로 보존)
+STATE_DIR = os.environ.get('STATE_DIR', '.state')
+
+# HTTP 커넥션 풀 크기 (동시 수집 스레드 수 상한)
+HTTP_POOL_SIZE = 10
+
+# 필요한 태그만 파싱 (이미지/게시글 썸네일/제목)
+_STRAINER = SoupStrainer(['img', 'div', 'strong'])
+
+# 이미지 스타일 속성의 url("...") 패턴
+_URL_STYLE_RE = re.compile(r'url\(["\']?(.*?)["\']?\)')
+
+# 알려진 카카오 채널 HTML 구조를 BeautifulSoup 없이 바로 찾는 패턴
+_IMG_THUMB_TAG_RE = re.compile(r'<img\b[^>]*\sclass="[^"]*\bimg_thumb\b[^"]*"[^>]*>')
+_FIT_THUMB_TAG_RE = re.compile(r'<div\b[^>]*\sclass="[^"]*\bwrap_fit_thumb\b[^"]*"[^>]*>')
+_TITLE_TAG_RE = re.compile(r'<strong\b[^>]*\sclass="[^"]*\btit_card\b[^"]*"[^>]*>')
+_SRC_ATTR_RE = re.compile(r'\ssrc="([^"]*)"')
+_ALT_ATTR_RE = re.compile(r'\salt="([^"]*)"')
+_STYLE_ATTR_RE = re.compile(r'\sstyle="([^"]*)"')
+
+
+# 이메일 HTML 템플릿
+_EMAIL_HEADER = """
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; }}
+                .restaurant {{ margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
+                .restaurant h2 {{ color: #333; }}
+                .menu-image {{ max-width: 100%; height: auto; }}
+                .menu-text {{ background: #f5f5f5; padding: 10px; white-space: pre-wrap; }}
+                .warning {{ color: #ff6b6b; padding: 10px; background: #fff3cd; border-radius: 5px; }}
+            </style>
+        </head>
+        <body>
+            <h1>🍱 {today} 점심 메뉴</h1>
+        """
+
+_EMAIL_MENU = """
+                <div class="restaurant">
+                    <h2>🍽️ {restaurant}</h2>
+                    <p>📅 {date}</p>
+                    <img src="cid:image{index}" class="menu-image" alt="{restaurant} 메뉴"/>
+                    {menu_text}
+                </div>
+                """
+
+_EMAIL_WARNING_HEADER = """
+            <div class="warning">
+                <h3>⚠️ 아직 업데이트되지 않은 메뉴</h3>
+                <ul>
+            """
+
+_EMAIL_WARNING_FOOTER = """
+                </ul>
+            </div>
+            """
+
+_EMAIL_FOOTER = """
+        </body>
+        </html>
+        """
+
+
+def _parse_ymd(m, year):
+    """연/월/일 매치를 datetime으로 변환"""
+    return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+
+def _parse_month_day(m, year):
+    """월/일 매치를 해당 연도의 datetime으로 변환"""
+    return datetime(year, int(m.group(1)), int(m.group(2)))
+
+
+# 날짜 파서 선택 (기본: 한 번 순회하는 스캐너, DATE_PARSER=regex면 아래 정규식 사용)
+_USE_REGEX_DATE_PARSER = os.environ.get('DATE_PARSER', '').strip().lower() == 'regex'
+
+# 날짜 패턴 (앞에서부터 순서대로 시도)
+_DATE_PATTERNS = [
+    # 2026년 02월 05일
+    (re.compile(r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일'), _parse_ymd),
+    # 2월 5일 (목)
+    (re.compile(r'(\d{1,2})월\s*(\d{1,2})일'), _parse_month_day),
+    # 02.05 또는 2.5
+    (re.compile(r'(\d{1,2})\.(\d{1,2})'), _parse_month_day),
+    # 2/5
+    (re.compile(r'(\d{1,2})/(\d{1,2})'), _parse_month_day),
+]
+
+
+def _read_number(text, pos, suffix):
+    """pos부터 공백을 건너뛴 뒤 1~2자리 숫자 + suffix를 읽어 (값, suffix 위치) 반환"""
+    n = len(text)
+    while pos < n and text[pos].isspace():
+        pos += 1
+    start = pos
+    while pos < n and text[pos].isdecimal():
+        pos += 1
+    if 1 <= pos - start <= 2 and pos < n and text[pos] == suffix:
+        return int(text[start:pos]), pos
+    return None
+
+
+def _scan_dates(text):
+    """한 번의 순회로 날짜 후보 찾기 (_DATE_PATTERNS와 같은 우선순위의 (연, 월, 일) 목록)"""
+    # 형식별 가장 앞의 후보 (년월일, 월일, 점(.), 슬래시(/) 순서, 연도가 없으면 None)
+    candidates = [None, None, None, None]
+    n = len(text)
+    i = 0
+    while i < n:
+        if not text[i].isdecimal():
+            i += 1
+            continue
+        
+        # 연속된 숫자 묶음 읽기
+        start = i
+        while i < n and text[i].isdecimal():
+            i += 1
+        digits = text[start:i]
+        sep = text[i] if i < n else ''
+        
+        if sep == '년':
+            # 2026년 02월 05일
+            if candidates[0] is None and len(digits) >= 4:
+                month = _read_number(text, i + 1, '월')
+                if month:
+                    day = _read_number(text, month[1] + 1, '일')
+                    if day:
+                        candidates[0] = (int(digits[-4:]), month[0], day[0])
+        elif sep == '월':
+            # 2월 5일 (목)
+            if candidates[1] is None:
+                day = _read_number(text, i + 1, '일')
+                if day:
+                    candidates[1] = (None, int(digits[-2:]), day[0])
+        elif sep in ('.', '/'):
+            # 02.05 또는 2.5, 2/5
+            slot = 2 if sep == '.' else 3
+            end = i + 1
+            while end < n and end < i + 3 and text[end].isdecimal():
+                end += 1
+            if candidates[slot] is None and end > i + 1:
+                candidates[slot] = (None, int(digits[-2:]), int(text[i + 1:end]))
+    
+    return [candidate for candidate in candidates if candidate]
+
+
+def _parse_date(text, today_year):
+    """텍스트에서 날짜 파싱 (연도가 없는 형식은 today_year 사용)"""
+    if _USE_REGEX_DATE_PARSER:
+        for pattern, parser in _DATE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                try:
+                    return parser(match, today_year)
+                except ValueError:
+                    continue
+        return None
+    
+    for year, month, day in _scan_dates(text):
+        try:
+            return datetime(year or today_year, month, day)
+        except ValueError:
+            continue
+    return None
+
+
+def _find_profile_image_src(html):
+    """정규식으로 프로필 이미지(img.img_thumb) src 찾기"""
+    for match in _IMG_THUMB_TAG_RE.finditer(html):
+        tag = match.group(0)
+        alt = _ALT_ATTR_RE.search(tag)
+        src = _SRC_ATTR_RE.search(tag)
+        if alt and src and unescape(alt.group(1)) == '프로필이미지':
+            return unescape(src.group(1))
+    return None
+
+
+def _find_thumb_style(html):
+    """정규식으로 게시글 썸네일(div.wrap_fit_thumb) style 속성 찾기"""
+    match = _FIT_THUMB_TAG_RE.search(html)
+    if match:
+        style = _STYLE_ATTR_RE.search(match.group(0))
+        if style:
+            return style.group(1)
+    return None
+
+
+def _find_post_title(html):
+    """정규식으로 첫 게시글 제목(strong.tit_card) 찾기 (하위 태그가 있으면 None)"""
+    match = _TITLE_TAG_RE.search(html)
+    if match:
+        end = html.find('</strong>', match.end())
+        title = html[match.end():end] if end != -1 else ''
+        # 제목 안에 태그가 있으면 BeautifulSoup으로 처리하도록 넘김
+        if '<' not in title:
+            return unescape(title).strip() or None
+    return None
+
+
+def _mark_sent(path):
+    """오늘 전송 완료 표시 파일 생성 (다음 예약 실행에서 중복 전송 방지)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(datetime.now().isoformat())
+
+
+def create_session(headers=None):
+    """커넥션 풀을 공유하는 HTTP 세션 생성"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class EasyOCRBackend:
+    """EasyOCR 백엔드 (기본값)"""
+    name = 'easyocr'
+    
+    def __init__(self):
+        self.reader = easyocr.Reader(['ko', 'en'], gpu=False)
+    
+    def readtext(self, images):
+        """이미지 목록을 한 번의 배치 호출로 OCR (이미지별 텍스트 반환)"""
+        # 같은 크기의 캔버스에 붙여 배치 텐서 크기를 맞춤
+        width = max(image.width for image in images)
+        height = max(image.height for image in images)
+        arrays = []
+        for image in images:
+            canvas = Image.new('RGB', (width, height), (255, 255, 255))
+            canvas.paste(image, (0, 0))
+            arrays.append(np.array(canvas))
+        
+        # 검출/인식 모델을 한 번에 실행
+        batch_results = self.reader.readtext_batched(arrays, batch_size=len(arrays))
+        return ['\n'.join(text for (bbox, text, conf) in results) for results in batch_results]
+
+
+class PaddleOCRBackend:
+    """PaddleOCR 백엔드 (PP-OCRv4 모바일 모델, CPU MKL-DNN 가속)"""
+    name = 'paddleocr'
+    
+    def __init__(self):
+        from paddleocr import PaddleOCR  # 선택 의존성 (2.x API): pip install "paddleocr<3" "paddlepaddle<3"
+        self.ocr = PaddleOCR(
+            use_angle_cls=False,
+            lang='korean',
+            ocr_version='PP-OCRv4',
+            enable_mkldnn=True,
+            show_log=False
+        )
+    
+    def readtext(self, images):
+        """이미지별로 검출 후 단어 영역을 배치 인식 (이미지별 텍스트 반환)"""
+        texts = []
+        for image in images:
+            # PaddleOCR은 BGR 배열을 기대함
+            result = self.ocr.ocr(np.array(image)[:, :, ::-1], det=True, rec=True, cls=False)
+            lines = result[0] or []
+            texts.append('\n'.join(text for (bbox, (text, conf)) in lines))
+        return texts
+
+
+OCR_BACKENDS = {
+    EasyOCRBackend.name: EasyOCRBackend,
+    PaddleOCRBackend.name: PaddleOCRBackend,
+}
+
+
+def create_ocr_backend():
+    """OCR_BACKEND 환경 변수에 따라 OCR 백엔드 생성"""
+    name = os.environ.get('OCR_BACKEND', EasyOCRBackend.name).strip().lower()
+    if name not in OCR_BACKENDS:
+        logger.warning(f"알 수 없는 OCR_BACKEND '{name}' - {EasyOCRBackend.name} 사용")
+        name = EasyOCRBackend.name
+    logger.info(f"OCR 백엔드: {name}")
+    try:
+        return OCR_BACKENDS[name]()
+    except Exception as e:
+        if name == EasyOCRBackend.name:
+            raise
+        # 선택 의존성이 없거나 초기화에 실패하면 기본 백엔드로 대체
+        logger.error(f"{name} 백엔드 초기화 실패 - {EasyOCRBackend.name} 사용: {e}")
+        return EasyOCRBackend()
+
 
 class Restaurant:
     """식당 정보 클래스"""
-    def __init__(self, name, url, channel_id, date_in_post=True):
+    def __init__(self, name, url, channel_id, date_in_post=True, require_ocr=False):
         self.name = name
         self.url = url
         self.channel_id = channel_id
+        self.require_ocr = require_ocr  # True면 제목으로 날짜가 확인돼도 OCR 텍스트 추출
         self.date_in_post = date_in_post  # False면 이미지에서만 날짜 확인
 
 
@@ -36,55 +339,89 @@ class MenuScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         self.reader = None  # EasyOCR reader는 필요할 때 초기화
+        self.session = create_session(self.headers)  # 모든 요청에서 연결 재사용
         
     def init_ocr(self):
         """OCR 리더 초기화 (지연 로딩)"""
-        if self.reader is None:
+        global _OCR_BACKEND
+        if _OCR_BACKEND is None:
             logger.info("OCR 엔진 초기화 중...")
-            self.reader = easyocr.Reader(['ko', 'en'], gpu=False)
+            _OCR_BACKEND = create_ocr_backend()
             logger.info("OCR 엔진 초기화 완료")
+        self.reader = _OCR_BACKEND
     
     def fetch_page(self, url):
         """웹페이지 가져오기"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             return response.text
         except Exception as e:
             logger.error(f"페이지 로드 실패 ({url}): {e}")
             return None
     
-    def extract_image_url(self, html, restaurant):
-        """HTML에서 이미지 URL 추출"""
-        from html import unescape
-        from urllib.parse import unquote, parse_qs, urlparse
+    def fetch_latest_post(self, channel_id):
+        """카카오 채널 게시글 API(JSON)에서 최신 게시글의 이미지 URL/제목 가져오기"""
+        try:
+            response = self.session.get(
+                KAKAO_POSTS_API.format(channel_id=channel_id),
+                params={'limit': 1},
+                timeout=10
+            )
+            response.raise_for_status()
+            items = response.json().get('items') or []
+        except Exception as e:
+            logger.warning(f"게시글 API 조회 실패 ({channel_id}): {e}")
+            return None
+        
+        if not items:
+            return None
         
-        soup = BeautifulSoup(html, 'html.parser')
+        post = items[0]
+        for media in post.get('media') or []:
+            image_url = media.get('large_url') or media.get('url')
+            if image_url:
+                return {
+                    'image_url': image_url,
+                    'title': (post.get('title') or '').strip() or None
+                }
         
+        logger.warning(f"게시글 API 응답에 이미지가 없습니다 ({channel_id})")
+        return None
+    
+    def extract_image_url(self, html, restaurant):
+        """HTML에서 이미지 URL 추출 (정규식 우선, 실패 시 BeautifulSoup)"""
         if restaurant.name == "원테이블":
             # 프로필 이미지에서 추출
             # <img src="https://img1.daumcdn.net/thumb/C100x100.mplusfriend/?fname=http%3A%2F%2F..." 형식
-            img_tag = soup.find('img', class_='img_thumb', alt='프로필이미지')
-            if img_tag and 'src' in img_tag.attrs:
-                src = img_tag['src']
-                # fname 파라미터 추출
-                if 'fname=' in src:
-                    parsed = urlparse(src)
-                    params = parse_qs(parsed.query)
-                    if 'fname' in params:
-                        decoded_url = unquote(params['fname'][0])
-                        logger.info(f"원테이블 URL 추출: {decoded_url}")
-                        return decoded_url
+            src = _find_profile_image_src(html)
+            if src is None:
+                soup = BeautifulSoup(html, 'lxml', parse_only=_STRAINER)
+                img_tag = soup.find('img', class_='img_thumb', alt='프로필이미지')
+                if img_tag and 'src' in img_tag.attrs:
+                    src = img_tag['src']
+            # fname 파라미터 추출
+            if src and 'fname=' in src:
+                parsed = urlparse(src)
+                params = parse_qs(parsed.query)
+                if 'fname' in params:
+                    decoded_url = unquote(params['fname'][0])
+                    logger.info(f"원테이블 URL 추출: {decoded_url}")
+                    return decoded_url
         else:
             # 게시글 이미지 (왕의밥상, 착한한식뷔페)
             # <div class="wrap_fit_thumb" style="background-image: url(&quot;...&quot;);"> 형식
-            div = soup.find('div', class_='wrap_fit_thumb')
-            if div and 'style' in div.attrs:
-                style = div['style']
+            style = _find_thumb_style(html)
+            if style is None:
+                soup = BeautifulSoup(html, 'lxml', parse_only=_STRAINER)
+                div = soup.find('div', class_='wrap_fit_thumb')
+                if div and 'style' in div.attrs:
+                    style = div['style']
+            if style:
                 # HTML 엔티티 디코딩 (&quot; -> ")
                 style = unescape(style)
                 # url("...") 또는 url('...') 패턴 찾기
-                match = re.search(r'url\(["\']?(.*?)["\']?\)', style)
+                match = _URL_STYLE_RE.search(style)
                 if match:
                     image_url = match.group(1)
                     logger.info(f"{restaurant.name} URL 추출: {image_url}")
@@ -95,9 +432,12 @@ class MenuScraper:
     
     def extract_post_date(self, html):
         """게시글에서 날짜 추출"""
-        soup = BeautifulSoup(html, 'html.parser')
-        
         # 게시글 제목에서 날짜 찾기
+        title = _find_post_title(html)
+        if title:
+            return title
+        
+        soup = BeautifulSoup(html, 'lxml', parse_only=_STRAINER)
         title_tag = soup.find('strong', class_='tit_card')
         if title_tag:
             return title_tag.text.strip()
@@ -105,11 +445,13 @@ class MenuScraper:
         return None
     
     def download_image(self, url):
-        """이미지 다운로드"""
+        """이미지 다운로드 (PIL 이미지, 원본 바이트, Content-Type 반환)"""
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            return Image.open(BytesIO(response.content))
+            image_bytes = response.content
+            content_type = response.headers.get('Content-Type', 'image/jpeg')
+            return Image.open(BytesIO(image_bytes)), image_bytes, content_type
         except Exception as e:
             logger.error(f"이미지 다운로드 실패: {e}")
             return None
@@ -117,130 +459,211 @@ class MenuScraper:
     def preprocess_image(self, image):
         """이미지 전처리 (OCR 정확도 향상)"""
         # 이미지가 너무 크면 리사이즈
-        max_size = 2000
+        max_size = OCR_MAX_SIZE
         if max(image.size) > max_size:
             ratio = max_size / max(image.size)
             new_size = tuple(int(dim * ratio) for dim in image.size)
-            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            # JPEG는 디코딩 단계에서 흑백/축소(DCT 스케일링)해서 읽어 전체 해상도 디코딩 생략
+            if image.format == 'JPEG':
+                image.draft('L', new_size)
+            if image.size != new_size:
+                image = image.resize(new_size, Image.Resampling.BILINEAR)
+        
+        # 흑백으로 변환해 JPEG 색 노이즈 제거 후 RGB 3채널로 복원 (EasyOCR 입력 형식)
+        return image.convert('L').convert('RGB')
+    
+    def run_ocr_batch(self, images):
+        """여러 이미지를 한 번의 배치 호출로 OCR 처리"""
+        if not images:
+            return []
         
-        # RGB로 변환
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        texts = [""] * len(images)
+        try:
+            self.init_ocr()
+        except Exception as e:
+            logger.error(f"OCR 엔진 초기화 실패: {e}")
+            return texts
         
-        return image
-    
-    def extract_text_from_image(self, image):
-        """이미지에서 텍스트 추출"""
-        self.init_ocr()
+        # 이미지 전처리 (손상된 이미지는 빈 텍스트로 처리하고 나머지만 OCR)
+        prepared = []
+        for index, image in enumerate(images):
+            try:
+                prepared.append((index, self.preprocess_image(image)))
+            except Exception as e:
+                logger.error(f"이미지 전처리 실패: {e}")
         
-        # 이미지 전처리
-        image = self.preprocess_image(image)
+        if not prepared:
+            return texts
         
         # OCR 수행
         try:
-            results = self.reader.readtext(image)
-            # 텍스트만 추출
-            texts = [text for (bbox, text, conf) in results]
-            return '\n'.join(texts)
+            ocr_texts = self.reader.readtext([image for _, image in prepared])
         except Exception as e:
             logger.error(f"OCR 처리 실패: {e}")
-            return ""
-    
-    def parse_date(self, text):
-        """텍스트에서 날짜 파싱"""
-        patterns = [
-            # 2026년 02월 05일
-            (r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일', lambda m: datetime(
-                int(m.group(1)), int(m.group(2)), int(m.group(3))
-            )),
-            # 2월 5일 (목)
-            (r'(\d{1,2})월\s*(\d{1,2})일', lambda m: datetime(
-                datetime.now().year, int(m.group(1)), int(m.group(2))
-            )),
-            # 02.05 또는 2.5
-            (r'(\d{1,2})\.(\d{1,2})', lambda m: datetime(
-                datetime.now().year, int(m.group(1)), int(m.group(2))
-            )),
-            # 2/5
-            (r'(\d{1,2})/(\d{1,2})', lambda m: datetime(
-                datetime.now().year, int(m.group(1)), int(m.group(2))
-            )),
-        ]
-        
-        for pattern, parser in patterns:
-            match = re.search(pattern, text)
-            if match:
-                try:
-                    date = parser(match)
-                    logger.info(f"날짜 파싱 성공: {text} -> {date.strftime('%Y-%m-%d')}")
-                    return date
-                except ValueError:
-                    continue
+            return texts
         
-        logger.warning(f"날짜 파싱 실패: {text}")
-        return None
+        for (index, _), text in zip(prepared, ocr_texts):
+            texts[index] = text
+        return texts
+    
+    def parse_date(self, text, today=None):
+        """텍스트에서 날짜 파싱 (연도가 없는 형식은 today의 연도 사용)"""
+        if today is None:
+            today = datetime.now().date()
+        date = _parse_date(text, today.year)
+        if date:
+            logger.info(f"날짜 파싱 성공: {text} -> {date.strftime('%Y-%m-%d')}")
+        else:
+            logger.warning(f"날짜 파싱 실패: {text}")
+        return date
     
-    def is_today(self, date):
+    def is_today(self, date, today=None):
         """오늘 날짜인지 확인"""
         if date is None:
             return False
-        today = datetime.now().date()
+        if today is None:
+            today = datetime.now().date()
         return date.date() == today
     
-    def scrape_menu(self, restaurant):
-        """식당 메뉴 스크래핑"""
+    def fetch_and_extract(self, restaurant, today):
+        """페이지와 이미지를 가져와 OCR 직전 단계까지 처리"""
         logger.info(f"=== {restaurant.name} 스크래핑 시작 ===")
         
-        # 1. 페이지 가져오기
-        html = self.fetch_page(restaurant.url)
-        if not html:
-            return None
+        html = None
+        post_title = None
         
-        # 2. 이미지 URL 추출
-        image_url = self.extract_image_url(html, restaurant)
-        if not image_url:
-            logger.warning(f"{restaurant.name}: 이미지 URL을 찾을 수 없습니다")
-            return None
+        # 1. 게시글 API(JSON)로 먼저 시도 (페이지 로딩/HTML 파싱 생략)
+        post = self.fetch_latest_post(restaurant.channel_id) if restaurant.date_in_post else None
+        if post:
+            image_url = post['image_url']
+            post_title = post['title']
+        else:
+            # API 실패 시 또는 프로필 이미지를 쓰는 식당은 페이지에서 추출
+            html = self.fetch_page(restaurant.url)
+            if not html:
+                return None
+            
+            # 2. 이미지 URL 추출
+            image_url = self.extract_image_url(html, restaurant)
+            if not image_url:
+                logger.warning(f"{restaurant.name}: 이미지 URL을 찾을 수 없습니다")
+                return None
+            
+            # 게시글 제목 추출
+            if restaurant.date_in_post:
+                post_title = self.extract_post_date(html)
         
         logger.info(f"이미지 URL: {image_url}")
+        if post_title:
+            logger.info(f"게시글 제목: {post_title}")
         
         # 3. 이미지 다운로드
-        image = self.download_image(image_url)
-        if not image:
+        downloaded = self.download_image(image_url)
+        if not downloaded:
             return None
+        image, image_bytes, image_content_type = downloaded
         
-        # 4. 날짜 확인
-        menu_date = None
+        # 4. 게시글 제목에서 날짜 확인
+        menu_date = self.parse_date(post_title, today) if post_title else None
         
-        if restaurant.date_in_post:
-            # 게시글 제목에서 날짜 추출
-            post_title = self.extract_post_date(html)
-            if post_title:
-                logger.info(f"게시글 제목: {post_title}")
-                menu_date = self.parse_date(post_title)
+        return {
+            'restaurant': restaurant,
+            'html': html,
+            'image_url': image_url,
+            'image': image,
+            'image_bytes': image_bytes,
+            'image_content_type': image_content_type,
+            'post_title': post_title,
+            'menu_date': menu_date
+        }
+    
+    def needs_ocr(self, fetched, today):
+        """OCR 필요 여부 확인 (게시글 제목으로 오늘 메뉴가 확인되면 생략)"""
+        restaurant = fetched['restaurant']
+        if restaurant.require_ocr or not restaurant.date_in_post:
+            return True
+        if self.is_today(fetched['menu_date'], today):
+            logger.info(f"{restaurant.name}: 게시글 제목으로 오늘 메뉴 확인 - OCR 생략")
+            return False
+        return True
+    
+    def build_result(self, fetched, ocr_text, today):
+        """수집한 정보와 OCR 결과로 메뉴 결과 생성"""
+        restaurant = fetched['restaurant']
+        if ocr_text:
+            logger.info(f"{restaurant.name} OCR 결과:\n{ocr_text[:200]}...")
         
-        # 5. OCR로 이미지에서 텍스트 추출 (날짜 또는 메뉴 정보)
-        ocr_text = self.extract_text_from_image(image)
-        logger.info(f"OCR 결과:\n{ocr_text[:200]}...")
+        # 5. 날짜 확인 (게시글 제목 우선)
+        menu_date = fetched['menu_date']
         
         # 원테이블의 경우 이미지에서 날짜 추출
-        if not restaurant.date_in_post or menu_date is None:
-            menu_date = self.parse_date(ocr_text)
+        if ocr_text and (not restaurant.date_in_post or menu_date is None):
+            menu_date = self.parse_date(ocr_text, today)
         
         # 6. 오늘 날짜 확인
-        is_today_menu = self.is_today(menu_date)
+        is_today_menu = self.is_today(menu_date, today)
         
         result = {
             'restaurant': restaurant.name,
             'date': menu_date.strftime('%Y-%m-%d') if menu_date else '날짜 미확인',
             'is_today': is_today_menu,
-            'image_url': image_url,
+            'image_url': fetched['image_url'],
             'menu_text': ocr_text,
-            'image': image
+            'image': fetched['image'],
+            'image_bytes': fetched['image_bytes'],
+            'image_content_type': fetched['image_content_type']
         }
         
         logger.info(f"{restaurant.name} 스크래핑 완료 - 오늘 메뉴: {is_today_menu}")
         return result
+    
+    def scrape_menus(self, restaurants, today=None):
+        """식당 메뉴 스크래핑 (수집 → 배치 OCR → 결과 생성)"""
+        # 오늘 날짜는 한 번만 계산해 모든 단계에서 공유
+        if today is None:
+            today = datetime.now().date()
+        
+        # 페이지/이미지 수집은 네트워크 대기가 대부분이므로 식당별로 동시에 실행
+        # (동시 요청 수는 세션 커넥션 풀 크기로 제한)
+        workers = max(1, min(len(restaurants), HTTP_POOL_SIZE))
+        with ThreadPoolExecutor(max_workers=workers + 1) as executor:
+            # 이미지에서 날짜를 읽어야 하는 식당이 있으면 OCR 모델 로딩을 수집과 겹쳐서 진행
+            ocr_future = None
+            if any(r.require_ocr or not r.date_in_post for r in restaurants):
+                ocr_future = executor.submit(self.init_ocr)
+            futures = [executor.submit(self.fetch_and_extract, restaurant, today) for restaurant in restaurants]
+        
+        fetched = []
+        for restaurant, future in zip(restaurants, futures):
+            try:
+                item = future.result()
+                if item:
+                    fetched.append(item)
+            except Exception as e:
+                logger.error(f"{restaurant.name} 처리 중 오류: {e}")
+        
+        # 미리 시작한 OCR 모델 로딩이 실패했으면 OCR 생략
+        ocr_ready = True
+        if ocr_future is not None:
+            try:
+                ocr_future.result()
+            except Exception as e:
+                logger.error(f"OCR 엔진 초기화 실패 - OCR 생략: {e}")
+                ocr_ready = False
+        
+        # OCR이 필요한 이미지만 모아서 한 번에 OCR
+        ocr_items = [item for item in fetched if ocr_ready and self.needs_ocr(item, today)]
+        ocr_texts = self.run_ocr_batch([item['image'] for item in ocr_items])
+        for item, ocr_text in zip(ocr_items, ocr_texts):
+            item['ocr_text'] = ocr_text
+        
+        results = []
+        for item in fetched:
+            try:
+                results.append(self.build_result(item, item.get('ocr_text', ''), today))
+            except Exception as e:
+                logger.error(f"{item['restaurant'].name} 처리 중 오류: {e}")
+        return results
 
 
 class EmailNotifier:
@@ -251,15 +674,14 @@ class EmailNotifier:
         self.sender_password = sender_password
         self.recipient_email = recipient_email
     
-    def send_menu_notification(self, menu_results):
+    def send_menu_notification(self, menu_results, today=None):
         """메뉴 이메일 전송"""
         import smtplib
         from email.mime.text import MIMEText
         from email.mime.multipart import MIMEMultipart
         from email.mime.image import MIMEImage
-        from io import BytesIO
         
-        today = datetime.now().strftime('%Y년 %m월 %d일')
+        today = (today or datetime.now().date()).strftime('%Y년 %m월 %d일')
         
         # 이메일 메시지 생성
         msg = MIMEMultipart('related')
@@ -267,68 +689,54 @@ class EmailNotifier:
         msg['From'] = self.sender_email
         msg['To'] = self.recipient_email
         
-        # HTML 본문 시작
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                .restaurant {{ margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-                .restaurant h2 {{ color: #333; }}
-                .menu-image {{ max-width: 100%; height: auto; }}
-                .menu-text {{ background: #f5f5f5; padding: 10px; white-space: pre-wrap; }}
-                .warning {{ color: #ff6b6b; padding: 10px; background: #fff3cd; border-radius: 5px; }}
-            </style>
-        </head>
-        <body>
-            <h1>🍱 {today} 점심 메뉴</h1>
-        """
+        # HTML 본문은 조각을 모아 마지막에 한 번에 합침
+        parts = [_EMAIL_HEADER.format(today=today)]
         
         today_menus = [m for m in menu_results if m and m['is_today']]
         old_menus = [m for m in menu_results if m and not m['is_today']]
         
         if not today_menus and not old_menus:
-            html += "<p>❌ 오늘 메뉴를 찾을 수 없습니다.</p>"
+            parts.append("<p>❌ 오늘 메뉴를 찾을 수 없습니다.</p>")
         
         # 오늘 메뉴
-        if today_menus:
-            for i, menu in enumerate(today_menus):
-                html += f"""
-                <div class="restaurant">
-                    <h2>🍽️ {menu['restaurant']}</h2>
-                    <p>📅 {menu['date']}</p>
-                    <img src="cid:image{i}" class="menu-image" alt="{menu['restaurant']} 메뉴"/>
-                    <div class="menu-text">{menu['menu_text'][:1000]}</div>
-                </div>
-                """
+        for i, menu in enumerate(today_menus):
+            # OCR을 생략한 메뉴는 텍스트 영역 없이 이미지만 표시
+            menu_text_html = ''
+            if menu['menu_text']:
+                menu_text_html = f"<div class='menu-text'>{menu['menu_text'][:1000]}</div>"
+            
+            parts.append(_EMAIL_MENU.format(
+                restaurant=menu['restaurant'],
+                date=menu['date'],
+                index=i,
+                menu_text=menu_text_html
+            ))
+            
+            # 이미지 첨부
+            try:
+                # 스크래핑 시 받아 둔 원본 바이트를 그대로 첨부 (재다운로드 없음)
+                content_type = menu.get('image_content_type') or 'image/jpeg'
+                if '/' in content_type:
+                    subtype = content_type.split('/', 1)[1].split(';')[0].strip()
+                else:
+                    subtype = 'jpeg'
                 
-                # 이미지 첨부
-                try:
-                    response = requests.get(menu['image_url'], timeout=10)
-                    img = MIMEImage(response.content)
-                    img.add_header('Content-ID', f'<image{i}>')
-                    msg.attach(img)
-                except Exception as e:
-                    logger.error(f"이미지 첨부 실패: {e}")
+                img = MIMEImage(menu['image_bytes'], _subtype=subtype)
+                img.add_header('Content-ID', f'<image{i}>')
+                msg.attach(img)
+                logger.info(f"이미지 첨부 성공: {menu['restaurant']}")
+            except Exception as e:
+                logger.error(f"이미지 첨부 실패 ({menu['restaurant']}): {e}")
         
         # 아직 업데이트 안 된 메뉴
         if old_menus:
-            html += """
-            <div class="warning">
-                <h3>⚠️ 아직 업데이트되지 않은 메뉴</h3>
-                <ul>
-            """
+            parts.append(_EMAIL_WARNING_HEADER)
             for menu in old_menus:
-                html += f"<li>{menu['restaurant']} (마지막 업데이트: {menu['date']})</li>"
-            html += """
-                </ul>
-            </div>
-            """
+                parts.append(f"<li>{menu['restaurant']} (마지막 업데이트: {menu['date']})</li>")
+            parts.append(_EMAIL_WARNING_FOOTER)
         
-        html += """
-        </body>
-        </html>
-        """
+        parts.append(_EMAIL_FOOTER)
+        html = ''.join(parts)
         
         msg.attach(MIMEText(html, 'html', 'utf-8'))
         
@@ -346,9 +754,7 @@ class EmailNotifier:
 
 
 def main():
-    """메인 함수 - 재시도 로직 포함"""
-    import time
-    
+    """메인 함수 - 한 번 실행 (재시도는 GitHub Actions 예약 실행으로 처리)"""
     # 환경 변수에서 이메일 정보 가져오기
     SENDER_EMAIL = os.environ.get('SENDER_EMAIL')
     SENDER_PASSWORD = os.environ.get('SENDER_PASSWORD')
@@ -380,56 +786,55 @@ def main():
         ),
     ]
     
-    # 재시도 설정
-    MAX_RETRIES = 6  # 최대 6번 시도 (1.5시간)
-    RETRY_INTERVAL = 15 * 60  # 15분 (초 단위)
+    # 재시도는 GitHub Actions 예약 실행(15분 간격)이 담당, 마지막 예약 실행에서만 FINAL_ATTEMPT=true
+    # 로컬 실행은 다음 예약 실행이 없으므로 항상 마지막 시도로 처리하고 전송 완료 표시도 남기지 않음
+    in_actions = os.environ.get('GITHUB_ACTIONS', '').strip().lower() == 'true'
+    final_attempt = not in_actions or os.environ.get('FINAL_ATTEMPT', '').strip().lower() == 'true'
+    
+    # 오늘 날짜는 워크플로가 한국시간 기준으로 계산해 TODAY로 전달 (캐시 키와 같은 날짜 사용)
+    now = datetime.now()
+    today_env = os.environ.get('TODAY', '').strip()
+    today = datetime.strptime(today_env, '%Y-%m-%d').date() if today_env else now.date()
+    sent_marker = os.path.join(STATE_DIR, f"sent-{today.isoformat()}") if in_actions else None
+    
+    if sent_marker and os.path.exists(sent_marker):
+        logger.info("오늘 메뉴는 이미 전송했습니다. 프로그램 종료.")
+        return
+    
+    logger.info(f"{'='*60}")
+    logger.info(f"현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')} (마지막 시도: {final_attempt})")
+    logger.info(f"{'='*60}")
     
+    # 스크래핑 실행
     scraper = MenuScraper()
+    results = scraper.scrape_menus(restaurants, today=today)
     notifier = EmailNotifier(SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL)
     
-    for attempt in range(1, MAX_RETRIES + 1):
-        logger.info(f"\n{'='*60}")
-        logger.info(f"시도 {attempt}/{MAX_RETRIES}")
-        logger.info(f"현재 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        logger.info(f"{'='*60}")
-        
-        # 스크래핑 실행
-        results = []
-        for restaurant in restaurants:
-            try:
-                result = scraper.scrape_menu(restaurant)
-                if result:
-                    results.append(result)
-            except Exception as e:
-                logger.error(f"{restaurant.name} 처리 중 오류: {e}")
-        
-        # 오늘 날짜 메뉴가 있는지 확인
-        today_menus = [r for r in results if r and r['is_today']]
-        
-        if today_menus:
-            # 오늘 메뉴를 찾았으면 바로 전송하고 종료
-            logger.info(f"✅ 오늘 메뉴를 찾았습니다! ({len(today_menus)}개)")
-            notifier.send_menu_notification(results)
-            logger.info("이메일 전송 완료. 프로그램 종료.")
-            return
-        else:
-            # 오늘 메뉴가 없으면
-            logger.warning(f"⚠️ 아직 오늘 메뉴가 올라오지 않았습니다.")
-            
-            if attempt < MAX_RETRIES:
-                # 마지막 시도가 아니면 대기
-                wait_minutes = RETRY_INTERVAL // 60
-                logger.info(f"⏰ {wait_minutes}분 후에 다시 시도합니다...")
-                time.sleep(RETRY_INTERVAL)
-            else:
-                # 마지막 시도였으면 기존 메뉴라도 전송
-                logger.warning(f"⏰ 최대 재시도 횟수에 도달했습니다.")
-                if results:
-                    logger.info("가장 최근 메뉴를 전송합니다.")
-                    notifier.send_menu_notification(results)
-                else:
-                    logger.error("수집된 메뉴 정보가 없습니다.")
-                return
+    # 오늘 날짜 메뉴가 있는지 확인
+    today_menus = [r for r in results if r and r['is_today']]
+    
+    if today_menus:
+        # 오늘 메뉴를 찾았으면 전송하고 전송 완료 표시
+        logger.info(f"✅ 오늘 메뉴를 찾았습니다! ({len(today_menus)}개)")
+        if notifier.send_menu_notification(results, today) and sent_marker:
+            _mark_sent(sent_marker)
+        logger.info("이메일 전송 완료. 프로그램 종료.")
+        return
+    
+    logger.warning(f"⚠️ 아직 오늘 메뉴가 올라오지 않았습니다.")
+    
+    if not final_attempt:
+        logger.info("⏰ 다음 예약 실행에서 다시 확인합니다.")
+        return
+    
+    # 마지막 시도였으면 기존 메뉴라도 전송
+    logger.warning(f"⏰ 오늘의 마지막 시도입니다.")
+    if results:
+        logger.info("가장 최근 메뉴를 전송합니다.")
+        if notifier.send_menu_notification(results, today) and sent_marker:
+            _mark_sent(sent_marker)
+    else:
+        logger.error("수집된 메뉴 정보가 없습니다.")
 
 
 if __name__ == "__main__":